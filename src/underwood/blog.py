@@ -1,13 +1,22 @@
 """Provide our blog class that the user can call."""
 
+import os
+from typing import Iterator
+
 from jsonschema import validate as validate_json
 
+from underwood.cache import FragmentCache
+from underwood.check import Preflight
+from underwood.config import Config
 from underwood.feed import Feed
 from underwood.file import File
+from underwood.metadata import MetadataIndex
+from underwood.minify import Minifier
 from underwood.page import Archive
 from underwood.page import Home
 from underwood.page import Post
 from underwood.schema import schema
+from underwood.selection import Select
 from underwood.section import Bottom
 from underwood.section import Middle
 from underwood.section import Top
@@ -22,44 +31,195 @@ class Blog:
     """
 
     def __init__(self, path_to_info: str) -> None:
-        """Initialize blog with provided path to info file."""
+        """Initialize blog with provided path to info file.
+
+        If the info file doesn't have a posts array, we build one from
+        the front matter of the files in the input directory.
+        """
         self.info = File(path_to_info).read_json()
+        if Keys.POSTS.value not in self.info:
+            self.info[Keys.POSTS.value] = MetadataIndex(
+                self.info[Keys.INPUT_DIR_PATH.value],
+                self.info.get(Keys.METADATA_INDEX_PATH.value),
+            ).posts()
+        # Number of bytes minification shaved off the last build,
+        # including posts served already minified from the cache.
+        self.bytes_saved = 0
+        # Hit and miss statistics for the fragment cache from the last
+        # build, if the info file configures a cache.
+        self.cache_stats: dict = {}
+
+    def _open_cache(self) -> FragmentCache | None:
+        """Return the fragment cache configured in the info file, if any."""
+        if Keys.CACHE_FILE_PATH.value not in self.info:
+            return None
+        return FragmentCache(
+            self.info[Keys.CACHE_FILE_PATH.value],
+            self.info.get(
+                Keys.CACHE_MAX_BYTES.value, Config.FRAGMENT_CACHE_MAX_BYTES.value
+            ),
+        )
+
+    def _minify(self, html: str) -> str:
+        """Return the HTML minified if the info file asks us to.
+
+        Args:
+            html: the full HTML document for a page or post
+        """
+        if not self.info.get(Keys.MINIFY.value, False):
+            return html
+        minified = Minifier().minify(html)
+        self.bytes_saved += len(html.encode("utf-8")) - len(minified.encode("utf-8"))
+        return minified
+
+    def _render_page(self, page: dict, cache: FragmentCache | None) -> str | None:
+        """Return the contents of a page, or None if we don't render it.
+
+        Args:
+            page: page from the info file
+            cache: fragment cache to render through, if any
+        """
+        if ".html" in page[Keys.FILE_NAME.value]:
+            top = Top(self.info, page).contents()
+            bottom = Bottom(self.info, page).contents()
+            if page[Keys.FILE_NAME.value] == "index.html":
+                middle = Home(self.info).contents()
+            elif page[Keys.FILE_NAME.value] == "archive.html":
+                middle = Archive(self.info).contents()
+            else:
+                middle = Middle(self.info, page).contents()
+            return self._minify(top + middle + bottom)
+        if page[Keys.FILE_NAME.value] == "feed.xml":
+            return Feed(self.info, cache).contents()
+        return None
+
+    def _site_digest(self, cache: FragmentCache) -> str:
+        """Return a hash of the blog info that every post depends on.
+
+        Args:
+            cache: fragment cache we're rendering posts through
+        """
+        return cache.digest(
+            {
+                key.value: self.info.get(key.value)
+                for key in (Keys.DOMAIN_NAME, Keys.MINIFY, Keys.PAGES)
+            }
+        )
+
+    def _render_post(
+        self, post: dict, idx: int, cache: FragmentCache | None, site_digest: str
+    ) -> str:
+        """Return the contents of a post.
+
+        If we have a cache, we look the whole post up in it. Besides the
+        post itself, the post depends on the blog info, its source file,
+        and the posts before and after it, which it links to. We keep the
+        bytes minification saved on the first line of the cached post so
+        that bytes_saved counts posts we don't minify again.
+
+        Args:
+            post: post from the info file
+            idx: index of the post in the posts array
+            cache: fragment cache to render through, if any
+            site_digest: hash of the blog info the post depends on
+        """
+
+        def render() -> str:
+            top = Top(self.info, post).contents()
+            middle = Post(self.info, post).contents(idx)
+            bottom = Bottom(self.info, post).contents()
+            return self._minify(top + middle + bottom)
+
+        def render_entry() -> str:
+            before = self.bytes_saved
+            contents = render()
+            # We count the bytes saved below, whether or not we hit.
+            saved = self.bytes_saved - before
+            self.bytes_saved = before
+            return f"{saved}\n{contents}"
+
+        if cache is None:
+            return render()
+        posts = self.info[Keys.POSTS.value]
+        prev_file = posts[idx - 1][Keys.FILE_NAME.value] if idx > 0 else ""
+        next_file = posts[idx + 1][Keys.FILE_NAME.value] if idx + 1 < len(posts) else ""
+        source = os.stat(
+            f"{self.info[Keys.INPUT_DIR_PATH.value]}/{post[Keys.FILE_NAME.value]}"
+        )
+        entry = cache.fetch(
+            "post",
+            post,
+            render_entry,
+            site_digest,
+            prev_file,
+            next_file,
+            source.st_mtime_ns,
+            source.st_size,
+        )
+        saved, contents = entry.split("\n", 1)
+        self.bytes_saved += int(saved)
+        return contents
 
     def validate(self) -> None:
         """Validate the provided info file."""
         validate_json(self.info, schema)
 
-    def generate(self) -> None:
-        """Generate the blog based on the provided info file."""
-
-        pages = self.info[Keys.PAGES.value]
-        for page in pages:
-            if ".html" in page[Keys.FILE_NAME.value]:
-                top = Top(self.info, page).contents()
-                bottom = Bottom(self.info, page).contents()
-                output_file = File(
-                    f"{self.info[Keys.OUTPUT_DIR_PATH.value]}/{page[Keys.FILE_NAME.value]}"
-                )
-                if page[Keys.FILE_NAME.value] == "index.html":
-                    home = Home(self.info).contents()
-                    output_file.write(top + home + bottom)
-                elif page[Keys.FILE_NAME.value] == "archive.html":
-                    archive = Archive(self.info).contents()
-                    output_file.write(top + archive + bottom)
-                else:
-                    middle = Middle(self.info, page).contents()
-                    output_file.write(top + middle + bottom)
-            elif page[Keys.FILE_NAME.value] == "feed.xml":
-                feed = Feed(self.info)
-                feed.write()
+    def check(self) -> None:
+        """Check the blog's inputs before we render anything.
 
-        posts = self.info[Keys.POSTS.value]
-        for idx, post in enumerate(posts):
-            if ".html" in post[Keys.FILE_NAME.value]:
-                output_file = File(
-                    f"{self.info[Keys.OUTPUT_DIR_PATH.value]}/{post[Keys.FILE_NAME.value]}"
-                )
-                top = Top(self.info, post).contents()
-                middle = Post(self.info, post).contents(idx)
-                bottom = Bottom(self.info, post).contents()
-                output_file.write(top + middle + bottom)
+        This catches problems the schema can't, like missing source
+        files or posts that aren't in chronological order. Every problem
+        is reported at once in a PreflightError. Building the blog runs
+        this check first unless told not to.
+        """
+        Preflight(self.info).run()
+
+    def iter_outputs(
+        self, select: Select | None = None, check: bool = True
+    ) -> Iterator[tuple[str, str]]:
+        """Yield the path and contents of each page, post, and the feed.
+
+        We render one output at a time as the caller asks for it, so the
+        caller decides what to do with each output and only one rendered
+        output needs to be in memory at once.
+
+        Args:
+            select: only render the pages and posts this matches
+            check: whether to check the blog's inputs before rendering
+        Returns:
+            (path relative to the output directory, contents) pairs
+        """
+        if check:
+            self.check()
+        self.bytes_saved = 0
+        cache = self._open_cache()
+        try:
+            for page in self.info[Keys.PAGES.value]:
+                if select is None or select.matches(page):
+                    contents = self._render_page(page, cache)
+                    if contents is not None:
+                        yield page[Keys.FILE_NAME.value], contents
+
+            site_digest = "" if cache is None else self._site_digest(cache)
+            posts = self.info[Keys.POSTS.value]
+            for idx, post in enumerate(posts):
+                if ".html" in post[Keys.FILE_NAME.value] and (
+                    select is None or select.matches(post)
+                ):
+                    yield post[Keys.FILE_NAME.value], self._render_post(
+                        post, idx, cache, site_digest
+                    )
+        finally:
+            if cache is not None:
+                self.cache_stats = cache.stats()
+                cache.close()
+
+    def generate(self, select: Select | None = None, check: bool = True) -> None:
+        """Generate the blog based on the provided info file.
+
+        Args:
+            select: only generate the pages and posts this matches
+            check: whether to check the blog's inputs before rendering
+        """
+        for path, contents in self.iter_outputs(select, check):
+            File(f"{self.info[Keys.OUTPUT_DIR_PATH.value]}/{path}").write(contents)
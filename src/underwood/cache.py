@@ -0,0 +1,185 @@
+"""Provide a class that caches rendered fragments of the blog on disk.
+
+Most of a build is spent rendering the same posts from the same metadata
+as the last build. We key each rendered fragment by a hash of what went
+into it and keep the fragments in a single SQLite file, so subsequent
+builds only render fragments for posts that changed.
+
+A lookup costs a hash and a query, so we only cache fragments that cost
+more than that to render, e.g. a whole (possibly minified) post rather
+than the links and dates that go into it.
+"""
+
+import hashlib
+import json
+import sqlite3
+from typing import Callable
+
+from underwood.config import Config
+
+
+# pylint: disable=R0902
+class FragmentCache:
+    """Define a size-bounded, least recently used fragment cache."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = Config.FRAGMENT_CACHE_MAX_BYTES.value,
+    ) -> None:
+        """Open (or create) the cache file.
+
+        Args:
+            path: path to the SQLite file backing the cache
+            max_bytes: once the fragments exceed this size, we evict the
+                least recently used ones until they fit again
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("""CREATE TABLE IF NOT EXISTS fragments (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                used INTEGER NOT NULL
+            )""")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS fragments_used ON fragments (used)"
+        )
+        total, clock = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(used), 0) FROM fragments"
+        ).fetchone()
+        self._total_bytes: int = total
+        # Rather than trust the wall clock, we order accesses with a
+        # counter that carries over from the last build.
+        self._clock: int = clock
+        # Hits we haven't recorded in the database yet. We record them
+        # all at once rather than write to the database on every hit.
+        self._touched: list[tuple[int, str]] = []
+        # Digests of the records we've hashed so far, so that we hash
+        # each post once per build no matter how many fragments use it.
+        # We hold on to the record so that its id isn't reused.
+        self._digests: dict[int, tuple[dict, str]] = {}
+
+    def __enter__(self) -> "FragmentCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def digest(self, record: dict) -> str:
+        """Return a hash of a record, e.g. a post from the info file.
+
+        The hash also covers Config.FRAGMENT_VERSION, so bumping it
+        invalidates everything rendered from older templates.
+        """
+        known = self._digests.get(id(record))
+        if known is not None and known[0] is record:
+            return known[1]
+        payload = json.dumps([Config.FRAGMENT_VERSION.value, record], sort_keys=True)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        self._digests[id(record)] = (record, digest)
+        return digest
+
+    def key(self, kind: str, record: dict, *extra: object) -> str:
+        """Return the key for a fragment.
+
+        Args:
+            kind: name of the fragment, e.g. "post"
+            record: what the fragment is mostly rendered from, usually
+                a post from the info file
+            extra: anything else the fragment depends on
+        """
+        parts = [kind, self.digest(record), *(str(part) for part in extra)]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _tick(self) -> int:
+        """Return the next value of our access counter."""
+        self._clock += 1
+        return self._clock
+
+    def _flush_touched(self) -> None:
+        """Record the hits we've been holding on to in the database."""
+        self._connection.executemany(
+            "UPDATE fragments SET used = ? WHERE key = ?", self._touched
+        )
+        self._touched = []
+
+    def get(self, key: str) -> str | None:
+        """Return the cached fragment, or None if we don't have it."""
+        row = self._connection.execute(
+            "SELECT value FROM fragments WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched.append((self._tick(), key))
+        return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store a fragment, evicting old fragments if we're over size."""
+        size = len(key) + len(value.encode("utf-8"))
+        previous = self._connection.execute(
+            "SELECT size FROM fragments WHERE key = ?", (key,)
+        ).fetchone()
+        if previous is not None:
+            self._total_bytes -= previous[0]
+        self._connection.execute(
+            "INSERT OR REPLACE INTO fragments VALUES (?, ?, ?, ?)",
+            (key, value, size, self._tick()),
+        )
+        self._total_bytes += size
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used fragments until we fit again."""
+        # Eviction goes by what's in the database, so it must be current.
+        self._flush_touched()
+        cursor = self._connection.execute(
+            "SELECT key, size FROM fragments ORDER BY used"
+        )
+        evicted = []
+        for key, size in cursor:
+            if self._total_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._connection.executemany("DELETE FROM fragments WHERE key = ?", evicted)
+
+    def fetch(
+        self, kind: str, record: dict, render: Callable[[], str], *extra: object
+    ) -> str:
+        """Return the cached fragment, rendering and storing it if needed.
+
+        Args:
+            kind: name of the fragment, e.g. "post"
+            record: what the fragment is mostly rendered from
+            render: function that renders the fragment on a miss
+            extra: anything else the fragment depends on
+        """
+        key = self.key(kind, record, *extra)
+        fragment = self.get(key)
+        if fragment is None:
+            fragment = render()
+            self.put(key, fragment)
+        return fragment
+
+    def stats(self) -> dict:
+        """Return hit and miss counts along with the size of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self) -> None:
+        """Save the cache to disk and close it."""
+        self._flush_touched()
+        self._connection.commit()
+        self._connection.close()
@@ -0,0 +1,203 @@
+"""Provide a class that checks the blog's inputs before we render it.
+
+The schema only tells us whether the info file has the right shape. It
+doesn't tell us whether the files it lists exist or whether the posts
+are in the order the rest of the code assumes, and we'd rather find out
+about those problems before rendering than halfway through it.
+"""
+
+import os
+import re
+from datetime import date
+from functools import cache
+
+from underwood.keys import Keys
+
+# These pages are generated rather than read from the input directory.
+_GENERATED_PAGES = {"index.html", "archive.html", "feed.xml"}
+
+# We look these keys up for every post, and getting an enum's value is
+# slow enough to show up when there are a lot of posts.
+_FILE_NAME = Keys.FILE_NAME.value
+_DATE_KEYS = (Keys.DATE_PUBLISHED.value, Keys.DATE_UPDATED.value)
+_DATE_PUBLISHED = Keys.DATE_PUBLISHED.value
+_TAGS = Keys.TAGS.value
+
+_iso_8601_date = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+_kebab_case = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+
+class PreflightError(Exception):
+    """Define the error we raise when the blog's inputs have problems."""
+
+    def __init__(self, problems: list[str]) -> None:
+        """Initialize the error with every problem we found.
+
+        Args:
+            problems: human-readable description of each problem
+        """
+        self.problems = problems
+        super().__init__(
+            f"found {len(problems)} problem(s) with the blog's inputs:\n"
+            + "\n".join(problems)
+        )
+
+
+@cache
+def _is_real_date(value: str) -> bool:
+    """Return whether the string is a real date of the form yyyy-mm-dd.
+
+    Many posts share dates, so we remember the answer for each value.
+    """
+    match = _iso_8601_date.fullmatch(value)
+    if match is None:
+        return False
+    try:
+        date(*(int(part) for part in match.groups()))
+    except ValueError:
+        return False
+    return True
+
+
+@cache
+def _is_kebab_case(value: str) -> bool:
+    """Return whether the string is in lowercase-kebab-case."""
+    return _kebab_case.fullmatch(value) is not None
+
+
+class Preflight:
+    """Define a check of the blog's inputs that runs before rendering.
+
+    The info file may not have been validated against the schema, so we
+    check the type of each value before we use it rather than crash on
+    the first one that's wrong.
+    """
+
+    def __init__(self, info: dict) -> None:
+        """Initialize the check with the blog info.
+
+        Args:
+            info: our JSON info containing metadata about our blog
+        """
+        self.info = info
+        # These are filled in while we check the info.
+        self._problems: list[str] = []
+        self._seen: set[str] = set()
+        self._input_files: set[str] | None = None
+
+    def _list_input_dir(self) -> set[str]:
+        """Return the names of the files in the input directory.
+
+        We list the directory once instead of checking for each file.
+        """
+        with os.scandir(self.info[Keys.INPUT_DIR_PATH.value]) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+
+    def _check_file(self, item: object, kind: str, idx: int) -> str | None:
+        """Check a page's or post's file, and return its name if it has one.
+
+        Args:
+            item: page or post from the info file
+            kind: either "page" or "post", for reporting problems
+            idx: index of the item in its array, for reporting problems
+        """
+        if not isinstance(item, dict):
+            self._problems.append(f"{kind} {idx}: {item!r} isn't an object")
+            return None
+        file = item.get(_FILE_NAME)
+        if not isinstance(file, str):
+            self._problems.append(f"{kind} {idx}: file name {file!r} isn't a string")
+            return None
+        if file in self._seen:
+            self._problems.append(f"{file}: listed more than once")
+        self._seen.add(file)
+        if (
+            self._input_files is not None
+            and ".html" in file
+            and file not in self._input_files
+            and file not in _GENERATED_PAGES
+        ):
+            self._problems.append(f"{file}: missing from input directory")
+        return file
+
+    def _check_post_values(self, post: dict, file: str) -> None:
+        """Check a post's dates and tags.
+
+        Args:
+            post: post from the info file
+            file: name of the post's file, which we report problems under
+        """
+        for key in _DATE_KEYS:
+            if key in post:
+                value = post[key]
+                if not (isinstance(value, str) and _is_real_date(value)):
+                    self._problems.append(
+                        f"{file}: {key} date {value!r} isn't yyyy-mm-dd"
+                    )
+        tags = post.get(_TAGS, [])
+        if not isinstance(tags, list):
+            self._problems.append(f"{file}: tags {tags!r} isn't an array")
+            return
+        for tag in tags:
+            if not (isinstance(tag, str) and _is_kebab_case(tag)):
+                self._problems.append(f"{file}: tag {tag!r} isn't lowercase-kebab-case")
+
+    def _array(self, key: str) -> list:
+        """Return an array from the info, or an empty one if it isn't one.
+
+        Args:
+            key: key of the array in the info file, e.g. "posts"
+        """
+        array = self.info.get(key, [])
+        if not isinstance(array, list):
+            self._problems.append(f"{key} {array!r} isn't an array")
+            return []
+        return array
+
+    def _check_posts(self) -> None:
+        """Check the posts array."""
+        previous_published = None
+        for idx, post in enumerate(self._array(Keys.POSTS.value)):
+            file = self._check_file(post, "post", idx)
+            if not isinstance(post, dict):
+                continue
+            self._check_post_values(post, file or f"post {idx}")
+
+            published = post.get(_DATE_PUBLISHED)
+            if isinstance(published, str) and _is_real_date(published):
+                # ISO 8601 dates sort the same way as strings.
+                if previous_published is not None and published < previous_published:
+                    self._problems.append(
+                        f"{file}: published {published}, before the post "
+                        f"preceding it ({previous_published}); posts must be in "
+                        "ascending chronological order"
+                    )
+                previous_published = published
+
+    def problems(self) -> list[str]:
+        """Return every problem we find with the blog's inputs.
+
+        If we can't list the input directory, we say so and carry on
+        with the checks that don't need it.
+        """
+        self._problems = []
+        self._seen = set()
+        try:
+            self._input_files = self._list_input_dir()
+        except (KeyError, OSError) as error:
+            self._problems.append(f"can't list input directory: {error!r}")
+            self._input_files = None
+
+        inception_date = self.info.get(Keys.DATE_STARTED.value)
+        if not (isinstance(inception_date, str) and _is_real_date(inception_date)):
+            self._problems.append(f"inception date {inception_date!r} isn't yyyy-mm-dd")
+        for idx, page in enumerate(self._array(Keys.PAGES.value)):
+            self._check_file(page, "page", idx)
+        self._check_posts()
+        return self._problems
+
+    def run(self) -> None:
+        """Raise an error listing every problem, if there are any."""
+        problems = self.problems()
+        if problems:
+            raise PreflightError(problems)
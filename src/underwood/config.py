@@ -7,3 +7,10 @@ class Config(Enum):
     """Set configuration variables."""
 
     NUM_POSTS_ON_HOME_PAGE = 5
+
+    # Bump this whenever a template or the layout of a cached fragment
+    # changes so that fragments cached by older versions aren't used.
+    FRAGMENT_VERSION = 2
+
+    # Upper bound on the size of the fragment cache file's contents.
+    FRAGMENT_CACHE_MAX_BYTES = 64 * 1024 * 1024
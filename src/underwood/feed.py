@@ -2,20 +2,24 @@
 
 import xml.etree.ElementTree as ET
 from datetime import date
+from functools import partial
 
+from underwood.cache import FragmentCache
 from underwood.file import File
 
 
 class Feed:
     """Define methods for making an Atom feed."""
 
-    def __init__(self, info: dict) -> None:
+    def __init__(self, info: dict, cache: FragmentCache | None = None) -> None:
         """Initialize the feed object with the blog info.
 
         Args:
             info: our JSON info containing metadata about our blog
+            cache: optional cache for entries rendered from posts
         """
         self.info = info
+        self.cache = cache
 
         # Create the root element of the XML document so that our
         # methods have it.
@@ -61,9 +65,9 @@ class Feed:
             else "Insert subtitle here"
         )
         ET.SubElement(self.root, "subtitle").text = subtitle
-        ET.SubElement(
-            self.root, "id"
-        ).text = f"tag:{self.info['domain_name']},{self.info['inception_date']}:/"
+        ET.SubElement(self.root, "id").text = (
+            f"tag:{self.info['domain_name']},{self.info['inception_date']}:/"
+        )
         ET.SubElement(self.root, "updated").text = date.today().strftime("%Y-%m-%d")
         ET.SubElement(
             self.root,
@@ -73,13 +77,13 @@ class Feed:
             href=f"https://{self.info['domain_name']}/",
         )
 
-    def _add_entry(self, post: dict) -> None:
-        """Add a single entry to the root element of the XML document.
+    def _entry(self, post: dict) -> ET.Element:
+        """Return a single entry for the XML document.
 
         Args:
             post: blog post we're making an entry for
         """
-        entry = ET.SubElement(self.root, "entry")
+        entry = ET.Element("entry")
 
         # Write author element to the entry.
         author = ET.SubElement(entry, "author")
@@ -101,17 +105,56 @@ class Feed:
         for tag in post["tags"]:
             ET.SubElement(entry, "category", scheme=url, term=tag)
         ET.SubElement(entry, "summary", type="html").text = post["description"]
+        return entry
 
-    def _add_entries(self) -> None:
-        """Add all entries to the root of the XML document."""
-        for post in self.info["posts"]:
-            self._add_entry(post)
+    def _entry_xml(self, post: dict) -> str:
+        """Return a single entry serialized the way it appears in the feed.
 
-    def write(self) -> None:
-        """Write the Atom feed to disk."""
+        We indent it as a child of the root element, so that we can
+        splice it into the serialized root as is.
+
+        Args:
+            post: blog post we're making an entry for
+        """
+        entry = self._entry(post)
+        ET.indent(entry, level=1)
+        return ET.tostring(entry, encoding="unicode")
+
+    def _entries_xml(self) -> list[str]:
+        """Return every entry serialized, using the cache if we have one."""
+        posts = self.info["posts"]
+        if self.cache is None:
+            return [self._entry_xml(post) for post in posts]
+        # The entries also depend on the blog's author and domain name.
+        author = self.info["author"]
+        domain_name = self.info["domain_name"]
+        return [
+            self.cache.fetch(
+                "feed-entry",
+                post,
+                partial(self._entry_xml, post),
+                author,
+                domain_name,
+            )
+            for post in posts
+        ]
+
+    def contents(self) -> str:
+        """Return the Atom feed as a string.
+
+        Serializing the entries makes up most of the work, so we
+        serialize the root with just its metadata and splice the
+        (possibly cached) entries in before its closing tag.
+        """
         self._add_metadata()
-        self._add_entries()
+        ET.indent(self.root)
+        root = ET.tostring(self.root, encoding="unicode")
+        closing_tag = "</feed>"
+        entries = "".join(f"  {entry}\n" for entry in self._entries_xml())
         xml_declaration = '<?xml version="1.0" encoding="utf-8"?>\n'
+        return xml_declaration + root[: -len(closing_tag)] + entries + closing_tag
+
+    def write(self) -> None:
+        """Write the Atom feed to disk."""
         output_file = File(f"{self.info['output_dir']}/feed.xml")
-        ET.indent(self.root)
-        output_file.write(xml_declaration + ET.tostring(self.root, encoding="unicode"))
+        output_file.write(self.contents())
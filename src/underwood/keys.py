@@ -16,6 +16,8 @@ class Keys(Enum):
     missing a rename. For a description of each key, see the schema.
     """
 
+    CACHE_FILE_PATH = "cache_file"
+    CACHE_MAX_BYTES = "cache_max_bytes"
     DATE_PUBLISHED = "published"
     DATE_STARTED = "inception_date"
     DATE_UPDATED = "updated"
@@ -23,6 +25,8 @@ class Keys(Enum):
     DOMAIN_NAME = "domain_name"
     FILE_NAME = "file"
     INPUT_DIR_PATH = "input_dir"
+    METADATA_INDEX_PATH = "metadata_index"
+    MINIFY = "minify"
     OUTPUT_DIR_PATH = "output_dir"
     PAGES = "pages"
     POSTS = "posts"
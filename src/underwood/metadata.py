@@ -0,0 +1,218 @@
+"""Provide helpers for keeping post metadata in the posts themselves.
+
+Instead of listing every post in the info file's posts array, each
+source file in the input directory can start with its metadata as a JSON
+object inside an HTML comment, e.g.
+
+    <!--
+    {"title": "Foo", "post_title": "All about foo", ...}
+    -->
+    <p>The rest of the post.</p>
+
+Reading every source file on every build would be slow for large blogs,
+so we keep an index of the metadata and only reread files whose size or
+modification time changed since the index was written. Even then, we
+only read as far as the end of the front matter.
+"""
+
+import gc
+import json
+import os
+
+from underwood.file import File
+from underwood.keys import Keys
+
+_FRONT_MATTER_START = "<!--"
+_FRONT_MATTER_END = "-->"
+
+# How much of a source file we read at a time looking for the end of
+# its front matter.
+_CHUNK_SIZE = 4096
+
+# Bump this whenever the layout of the index file changes.
+_INDEX_VERSION = 2
+
+
+def split_front_matter(text: str) -> tuple[dict | None, str]:
+    """Return the front matter of a source file and the rest of it.
+
+    If the file doesn't start with front matter, we return None and the
+    file as is.
+
+    Args:
+        text: contents of a source file
+    """
+    if not text.startswith(_FRONT_MATTER_START):
+        return None, text
+    end = text.find(_FRONT_MATTER_END)
+    if end == -1:
+        return None, text
+    try:
+        front_matter = json.loads(text[len(_FRONT_MATTER_START) : end])
+    except json.JSONDecodeError:
+        # This is just an ordinary comment.
+        return None, text
+    if not isinstance(front_matter, dict):
+        return None, text
+    return front_matter, text[end + len(_FRONT_MATTER_END) :].lstrip("\n")
+
+
+def read_front_matter(path: str) -> dict | None:
+    """Return the front matter of a source file, or None if it has none.
+
+    We read the file only up to the end of its front matter, so long
+    posts cost no more than short ones.
+
+    Args:
+        path: path to a source file
+    """
+    start = _FRONT_MATTER_START.encode("utf-8")
+    end = _FRONT_MATTER_END.encode("utf-8")
+    with open(path, mode="rb") as file:
+        head = file.read(len(start))
+        if head != start:
+            return None
+        found = -1
+        while found == -1:
+            chunk = file.read(_CHUNK_SIZE)
+            if not chunk:
+                return None
+            # The end marker may straddle the last chunk and this one.
+            search_from = max(len(start), len(head) - len(end) + 1)
+            head += chunk
+            found = head.find(end, search_from)
+    try:
+        text = head[: found + len(end)].decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    front_matter, _ = split_front_matter(text)
+    return front_matter
+
+
+class MetadataIndex:
+    """Define an index of the front matter of files in the input dir."""
+
+    def __init__(self, input_dir: str, index_path: str | None = None) -> None:
+        """Initialize the index.
+
+        Args:
+            input_dir: directory containing source HTML for the blog
+            index_path: file to keep the index in between builds; if
+                None, we read every source file each time
+        """
+        self.input_dir = input_dir
+        self.index_path = index_path
+
+    def _load(self) -> dict:
+        """Return the index from the last build, if there is one.
+
+        The index maps each file name to its [mtime, size] and keeps the
+        posts array built from the files' front matter. If the index
+        can't be read or isn't shaped like one, we start over with an
+        empty one.
+        """
+        empty: dict = {"version": _INDEX_VERSION, "files": {}, "posts": []}
+        if self.index_path is None or not os.path.exists(self.index_path):
+            return empty
+        try:
+            index = File(self.index_path).read_json()
+        except ValueError:
+            return empty
+        if (
+            not isinstance(index, dict)
+            or index.get("version") != _INDEX_VERSION
+            or not isinstance(index.get("files"), dict)
+            or not isinstance(index.get("posts"), list)
+        ):
+            return empty
+        return index
+
+    def _save(self, files: dict, posts: list[dict]) -> None:
+        """Write the index to disk for the next build."""
+        if self.index_path is not None:
+            index = {"version": _INDEX_VERSION, "files": files, "posts": posts}
+            File(self.index_path).write(json.dumps(index, separators=(",", ":")))
+
+    def _index_name(self) -> str | None:
+        """Return the index's file name if it's in the input directory.
+
+        The index may live alongside the source files, in which case we
+        don't want to index it.
+        """
+        if self.index_path is None:
+            return None
+        index_dir, index_name = os.path.split(os.path.abspath(self.index_path))
+        if index_dir != os.path.abspath(self.input_dir):
+            return None
+        return index_name
+
+    def _scan(self) -> dict:
+        """Return the [mtime, size] of each HTML file in the input directory.
+
+        Anything else in there, e.g. images, can't have front matter.
+        """
+        files = {}
+        index_name = self._index_name()
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                if (
+                    not entry.name.endswith(".html")
+                    or not entry.is_file()
+                    or entry.name == index_name
+                ):
+                    continue
+                stat = entry.stat()
+                files[entry.name] = [stat.st_mtime_ns, stat.st_size]
+        return files
+
+    def posts(self) -> list[dict]:
+        """Return the posts array built from the files' front matter.
+
+        The posts are sorted in ascending chronological order, the same
+        order the posts array in the info file is expected to be in.
+
+        Loading the index and scanning the input directory allocate a
+        lot of objects, none of which are garbage. We pause the garbage
+        collector until we're done so that it doesn't repeatedly walk
+        them all for nothing.
+        """
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._posts()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def _posts(self) -> list[dict]:
+        """Return the posts array, rereading only files that changed."""
+        index = self._load()
+        old_files = index["files"]
+        files = self._scan()
+        # Nothing was added, removed, or modified since the last build.
+        if files == old_files:
+            return index["posts"]
+
+        changed = {
+            name
+            for name, signature in files.items()
+            if old_files.get(name) != signature
+        }
+        file_key = Keys.FILE_NAME.value
+        posts_by_file = {
+            post[file_key]: post
+            for post in index["posts"]
+            if post[file_key] in files and post[file_key] not in changed
+        }
+        for name in changed:
+            front_matter = read_front_matter(os.path.join(self.input_dir, name))
+            if front_matter is not None:
+                front_matter[file_key] = name
+                posts_by_file[name] = front_matter
+        published_key = Keys.DATE_PUBLISHED.value
+        posts = sorted(
+            posts_by_file.values(),
+            key=lambda post: (post.get(published_key, ""), post[file_key]),
+        )
+        self._save(files, posts)
+        return posts
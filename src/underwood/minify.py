@@ -0,0 +1,187 @@
+"""Provide a class that minifies the HTML we generate.
+
+The templates in the section and page modules are indented and broken
+across lines so that they are easy to read, and the source HTML for
+each page or post usually is too. None of that whitespace matters to
+the browser, so we collapse it before writing the page to disk.
+"""
+
+import re
+from html.parser import HTMLParser
+
+# Whitespace inside these elements can be significant (even CSS has
+# string literals), so we leave their contents exactly as we found them.
+_PRESERVED_TAGS = {"pre", "script", "style", "textarea"}
+
+# Whitespace next to these elements never renders, so we can drop it
+# entirely instead of collapsing it to a single space.
+_BLOCK_TAGS = {
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "body",
+    "br",
+    "dd",
+    "details",
+    "div",
+    "dl",
+    "dt",
+    "fieldset",
+    "figcaption",
+    "figure",
+    "footer",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "head",
+    "header",
+    "hr",
+    "html",
+    "li",
+    "link",
+    "main",
+    "meta",
+    "nav",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "style",
+    "summary",
+    "table",
+    "tbody",
+    "td",
+    "tfoot",
+    "th",
+    "thead",
+    "title",
+    "tr",
+    "ul",
+}
+
+# Only HTML's own whitespace is insignificant. Python's \s would also
+# match e.g. non-breaking spaces, which do render.
+_whitespace = re.compile(r"[ \t\n\r\f]+")
+
+
+class Minifier(HTMLParser):
+    """Define a single-pass HTML minifier.
+
+    We rebuild the document from the events the parser gives us. Tags
+    are written back the way they appeared in the source, comments are
+    dropped, and runs of whitespace in text are collapsed to a single
+    space, or dropped if they sit next to a block-level element.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the minifier.
+
+        We don't want the parser to convert character references for
+        us, otherwise we would write out e.g. "<" where the source had
+        "&lt;".
+        """
+        self._output: list[str] = []
+        self._preserve_depth = 0
+        self._pending_space = False
+        self._after_block = True
+        super().__init__(convert_charrefs=False)
+
+    def reset(self) -> None:
+        """Reset the minifier so that it can be fed a new document."""
+        super().reset()
+        self._output = []
+        self._preserve_depth = 0
+        self._pending_space = False
+        # The start of the document behaves like a block boundary.
+        self._after_block = True
+
+    def _emit_text(self, text: str) -> None:
+        """Write text, flushing any whitespace that came before it."""
+        if self._pending_space and not self._after_block:
+            self._output.append(" ")
+        self._pending_space = False
+        self._after_block = False
+        self._output.append(text)
+
+    def _emit_tag(self, tag: str, markup: str) -> None:
+        """Write a tag, flushing any whitespace that came before it.
+
+        Args:
+            tag: lowercase name of the tag
+            markup: the tag as it should appear in the output
+        """
+        is_block = tag in _BLOCK_TAGS
+        if self._pending_space and not (is_block or self._after_block):
+            self._output.append(" ")
+        self._pending_space = False
+        self._after_block = is_block
+        self._output.append(markup)
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        self._emit_tag(tag, self.get_starttag_text() or f"<{tag}>")
+        if tag in _PRESERVED_TAGS:
+            self._preserve_depth += 1
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        self._emit_tag(tag, self.get_starttag_text() or f"<{tag}/>")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _PRESERVED_TAGS and self._preserve_depth > 0:
+            self._preserve_depth -= 1
+        self._emit_tag(tag, f"</{tag}>")
+
+    def handle_data(self, data: str) -> None:
+        if self._preserve_depth > 0:
+            self._emit_text(data)
+            return
+        collapsed = _whitespace.sub(" ", data)
+        if collapsed.startswith(" "):
+            self._pending_space = True
+            collapsed = collapsed[1:]
+        if collapsed.endswith(" "):
+            self._emit_text(collapsed[:-1])
+            self._pending_space = True
+        elif collapsed:
+            self._emit_text(collapsed)
+
+    def handle_entityref(self, name: str) -> None:
+        self._emit_text(f"&{name};")
+
+    def handle_charref(self, name: str) -> None:
+        self._emit_text(f"&#{name};")
+
+    def handle_comment(self, data: str) -> None:
+        # Keep conditional comments since they aren't really comments.
+        if data.startswith("[if"):
+            self._emit_text(f"<!--{data}-->")
+
+    def handle_decl(self, decl: str) -> None:
+        self._emit_tag("!doctype", f"<!{decl}>")
+        self._after_block = True
+
+    def handle_pi(self, data: str) -> None:
+        self._emit_text(f"<?{data}>")
+
+    def unknown_decl(self, data: str) -> None:
+        # The parser strips "<![" and "]>" from marked sections, but a
+        # CDATA section ends in "]]>", so it leaves one of those off too.
+        if data.startswith("CDATA["):
+            self._emit_text(f"<![{data}]]>")
+        else:
+            self._emit_text(f"<![{data}]>")
+
+    def minify(self, html: str) -> str:
+        """Return the given HTML with insignificant whitespace removed.
+
+        Args:
+            html: the full HTML document we want to minify
+        """
+        self.reset()
+        self.feed(html)
+        self.close()
+        return "".join(self._output)
@@ -37,6 +37,23 @@ schema = {
             "type": "string",
             "description": "This is the path to the directory where the generated blog is outputted.",
         },
+        Keys.CACHE_FILE_PATH.value: {
+            "type": "string",
+            "description": "This is the path to a file where rendered fragments are cached between builds. If omitted, nothing is cached.",
+        },
+        Keys.CACHE_MAX_BYTES.value: {
+            "type": "integer",
+            "minimum": 0,
+            "description": "This is the maximum size of the cached fragments before the least recently used ones are evicted.",
+        },
+        Keys.METADATA_INDEX_PATH.value: {
+            "type": "string",
+            "description": "This is the path to a file where the front matter of the source HTML is indexed between builds. It is only used if the posts array is omitted.",
+        },
+        Keys.MINIFY.value: {
+            "type": "boolean",
+            "description": "Whether to strip insignificant whitespace from the generated HTML. Defaults to false.",
+        },
         Keys.PAGES.value: {
             "type": "array",
             "description": "An array of pages in the blog.",
@@ -65,7 +82,7 @@ schema = {
         },
         Keys.POSTS.value: {
             "type": "array",
-            "description": "An array of blog posts.",
+            "description": "An array of blog posts. If omitted, posts are read from the front matter of the source HTML.",
             "items": {
                 "type": "object",
                 "properties": {
@@ -120,6 +137,5 @@ schema = {
         Keys.INPUT_DIR_PATH.value,
         Keys.OUTPUT_DIR_PATH.value,
         Keys.PAGES.value,
-        Keys.POSTS.value,
     ],
 }
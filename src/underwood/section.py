@@ -7,6 +7,7 @@ document, e.g. the top of the document.
 from string import Template
 
 from underwood.file import File
+from underwood.metadata import split_front_matter
 
 
 class Section:
@@ -99,11 +100,13 @@ class Middle(Section):
     def contents(self) -> str:
         """Return the middle section of the HTML document.
 
-        This is the stuff we want to sandwich between the body tags.
+        This is the stuff we want to sandwich between the body tags. If
+        the source file starts with front matter, we leave it out.
         """
         path = f"{self.info['input_dir']}/{self.page['file']}"
         file = File(path)
-        return file.read()
+        _, contents = split_front_matter(file.read())
+        return contents
 
 
 class Bottom(Section):
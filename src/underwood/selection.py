@@ -0,0 +1,53 @@
+"""Provide a class that selects which pages and posts to build."""
+
+from fnmatch import fnmatch
+
+from underwood.keys import Keys
+
+
+class Select:
+    """Define a filter for the pages and posts in the info file.
+
+    Every criterion that is given must match. Pages (and the feed) don't
+    have tags or dates, so they are only selected when we filter by file
+    name alone.
+    """
+
+    def __init__(
+        self,
+        files: str | None = None,
+        tag: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> None:
+        """Initialize the filter.
+
+        Args:
+            files: glob the file name must match, e.g. "foo-*.html"
+            tag: tag the post must be tagged under
+            since: ISO 8601 date the post must be published on or after
+            until: ISO 8601 date the post must be published on or before
+        """
+        self.files = files
+        self.tag = tag
+        self.since = since
+        self.until = until
+
+    def matches(self, page: dict) -> bool:
+        """Return whether the page (or post) is selected.
+
+        ISO 8601 dates sort the same way as strings, so we compare them
+        as strings.
+        """
+        if self.files is not None and not fnmatch(
+            page[Keys.FILE_NAME.value], self.files
+        ):
+            return False
+        if self.tag is not None and self.tag not in page.get(Keys.TAGS.value, []):
+            return False
+        published = page.get(Keys.DATE_PUBLISHED.value)
+        if self.since is not None and (published is None or published < self.since):
+            return False
+        if self.until is not None and (published is None or published > self.until):
+            return False
+        return True
@@ -1,6 +1,17 @@
 """Use underwood to generate a test blog."""
 
+import json
+from pathlib import Path
+
+import pytest
+
 from underwood.blog import Blog
+from underwood.cache import FragmentCache
+from underwood.check import PreflightError
+from underwood.file import File
+from underwood.metadata import MetadataIndex
+from underwood.minify import Minifier
+from underwood.selection import Select
 
 
 def test_underwood() -> None:
@@ -11,3 +22,198 @@ def test_underwood() -> None:
     test_blog = Blog("tests/data/test.json")
     test_blog.validate()
     test_blog.generate()
+
+
+def test_minify() -> None:
+    """Collapse whitespace but leave preformatted text, CSS, and scripts alone."""
+    html = """<!DOCTYPE html>
+<html>
+<head>
+    <style>p::before { content: '  x  '; }</style>
+</head>
+<body>
+    <p>
+        Some   <i>inline</i> <b>text</b> &amp; more
+    </p>
+    <pre>  keep
+    this  </pre>
+    <script>if (a  <  b) {  }</script>
+    <!-- drop me -->
+</body>
+</html>"""
+    assert Minifier().minify(html) == (
+        "<!DOCTYPE html><html><head><style>p::before { content: '  x  '; }</style>"
+        "</head><body><p>Some <i>inline</i> <b>text</b> &amp; more"
+        "</p><pre>  keep\n    this  </pre><script>if (a  <  b) {  }</script>"
+        "</body></html>"
+    )
+    assert Minifier().minify("<p>10\xa0km</p>\n<p>\xa0</p>") == (
+        "<p>10\xa0km</p><p>\xa0</p>"
+    )
+    svg = "<svg><style><![CDATA[ a > b {} ]]></style><![CDATA[ x ]]></svg>"
+    assert Minifier().minify(svg) == svg
+
+
+def test_fragment_cache(tmp_path: Path) -> None:
+    """Serve unchanged fragments from the cache and evict when full."""
+    path = str(tmp_path / "cache.sqlite")
+    post = {"file": "foo.html", "published": "2023-01-01"}
+    with FragmentCache(path) as cache:
+        assert cache.fetch("kind", post, lambda: "rendered") == "rendered"
+    with FragmentCache(path) as cache:
+        assert cache.fetch("kind", post, lambda: "re-rendered") == "rendered"
+        assert cache.fetch("kind", {**post, "tags": []}, lambda: "new") == "new"
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.fetch("kind", post, lambda: "other", "extra") == "other"
+    with FragmentCache(path, max_bytes=100) as cache:
+        cache.put(cache.key("kind", {}), "x" * 10)
+        assert cache.stats()["bytes"] <= 100
+        assert cache.get(cache.key("kind", post)) is None
+
+
+def test_fragment_cache_serves_warm_build(tmp_path: Path) -> None:
+    """Serve a whole build from a warm cache without changing the output.
+
+    How much faster that is depends on the machine, so we leave timing
+    it to benchmarks rather than assert on it here.
+    """
+    info = File("tests/data/test.json").read_json()
+    posts = []
+    for idx in range(300):
+        post = dict(info["posts"][idx % len(info["posts"])])
+        post["published"] = f"{2000 + idx // 12}-{idx % 12 + 1:02d}-01"
+        posts.append(post)
+    info["posts"] = posts
+    info["minify"] = True
+    File(str(tmp_path / "info.json")).write(json.dumps(info))
+
+    def build(cache_file: str | None) -> tuple[Blog, list]:
+        test_blog = Blog(str(tmp_path / "info.json"))
+        if cache_file is not None:
+            test_blog.info["cache_file"] = cache_file
+        # The posts reuse the same few source files, which the check
+        # would rightly complain about.
+        outputs = list(test_blog.iter_outputs(check=False))
+        return test_blog, outputs
+
+    uncached, uncached_outputs = build(None)
+    cold, cold_outputs = build(str(tmp_path / "cache.sqlite"))
+    warm, warm_outputs = build(str(tmp_path / "cache.sqlite"))
+    assert warm_outputs == cold_outputs == uncached_outputs
+    assert cold.cache_stats["hits"] == 0
+    assert warm.cache_stats["hits"] == cold.cache_stats["misses"] > 0
+    assert warm.cache_stats["misses"] == 0
+    assert warm.bytes_saved == cold.bytes_saved == uncached.bytes_saved > 0
+
+
+def test_iter_outputs() -> None:
+    """Yield only the outputs the selection matches."""
+    test_blog = Blog("tests/data/test.json")
+    paths = [path for path, _ in test_blog.iter_outputs(Select(tag="tag-3"))]
+    assert paths == [
+        "bar-1.html",
+        "bar-2.html",
+        "foo-3.html",
+        "baz-1.html",
+        "baz-2.html",
+    ]
+    paths = [
+        path
+        for path, _ in test_blog.iter_outputs(
+            Select(files="ba*", since="2023-03-01", until="2023-07-10")
+        )
+    ]
+    assert paths == ["bar-2.html", "bar-3.html", "baz-1.html"]
+    paths = [path for path, _ in test_blog.iter_outputs(Select(files="*.xml"))]
+    assert paths == ["feed.xml"]
+
+
+def test_front_matter(tmp_path: Path) -> None:
+    """Build the posts array from front matter when it's not in the info."""
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "about.html").write_text("<p>About</p>\n", encoding="utf-8")
+    # Neither of these can have front matter, so they aren't posts.
+    (src / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\xff\xfe")
+    (src / "broken.html").write_bytes(b"<!--\xff\xfe-->")
+    for name, published in [("new.html", "2023-02-02"), ("old.html", "2023-01-01")]:
+        front_matter = {
+            "title": name,
+            "post_title": name,
+            "description": name,
+            "tags": ["tag"],
+            "published": published,
+        }
+        (src / name).write_text(
+            f"<!--\n{json.dumps(front_matter)}\n-->\n<p>{name}</p>\n",
+            encoding="utf-8",
+        )
+    info = File("tests/data/test.json").read_json()
+    del info["posts"]
+    info["input_dir"] = str(src)
+    info["metadata_index"] = str(src / "index.json")
+    info["pages"] = [page for page in info["pages"] if page["file"] == "about.html"]
+    File(str(tmp_path / "info.json")).write(json.dumps(info))
+
+    test_blog = Blog(str(tmp_path / "info.json"))
+    test_blog.validate()
+    assert [post["file"] for post in test_blog.info["posts"]] == [
+        "old.html",
+        "new.html",
+    ]
+    outputs = dict(test_blog.iter_outputs())
+    assert "<!--" not in outputs["old.html"]
+    assert "<p>old.html</p>" in outputs["old.html"]
+
+    # The index is used as is when no source file changed.
+    index = MetadataIndex(str(src), str(src / "index.json"))
+    assert index.posts() == test_blog.info["posts"]
+
+    # An index that isn't shaped like one is rebuilt.
+    for broken_index in ["[]", '{"version": 2}', "{"]:
+        (src / "index.json").write_text(broken_index, encoding="utf-8")
+        assert index.posts() == test_blog.info["posts"]
+
+
+def test_check() -> None:
+    """Report every problem with the blog's inputs at once."""
+    test_blog = Blog("tests/data/test.json")
+    test_blog.check()
+    posts = test_blog.info["posts"]
+    posts.append(dict(posts[-1]))
+    posts.append({**posts[0], "file": "missing.html", "published": "2023-13-01"})
+    posts[1]["tags"] = ["Not Kebab", ["nested"]]
+    posts[2]["published"] = "2020-01-01"
+    posts[3]["updated"] = 20230301
+    with pytest.raises(PreflightError) as error:
+        list(test_blog.iter_outputs())
+    expected = [
+        "foo-2.html: tag 'Not Kebab' isn't lowercase-kebab-case",
+        "foo-2.html: tag ['nested'] isn't lowercase-kebab-case",
+        "bar-1.html: published 2020-01-01, before the post preceding it "
+        "(2022-02-02); posts must be in ascending chronological order",
+        "bar-2.html: updated date 20230301 isn't yyyy-mm-dd",
+        "baz-3.html: listed more than once",
+        "missing.html: missing from input directory",
+        "missing.html: published date '2023-13-01' isn't yyyy-mm-dd",
+    ]
+    assert error.value.problems == expected
+
+    # We still run every other check if we can't list the input dir.
+    test_blog.info["input_dir"] = "tests/data/does-not-exist"
+    with pytest.raises(PreflightError) as error:
+        test_blog.check()
+    assert error.value.problems[0].startswith("can't list input directory")
+    assert error.value.problems[1:] == [
+        problem for problem in expected if "missing from input" not in problem
+    ]
+
+    # Arrays that aren't arrays are reported rather than iterated.
+    test_blog.info["pages"] = {}
+    test_blog.info["posts"] = 5
+    with pytest.raises(PreflightError) as error:
+        test_blog.check()
+    assert error.value.problems[1:] == [
+        "pages {} isn't an array",
+        "posts 5 isn't an array",
+    ]